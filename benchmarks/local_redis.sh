@@ -0,0 +1,62 @@
+#!/bin/bash
+# Local Redis processes for checking the session store against each topology.
+#
+#   benchmarks/local_redis.sh replicas   primary on 7000, replicas on 7001 and 7002
+#   benchmarks/local_redis.sh cluster    cluster of three primaries (7100-7102),
+#                                        one replica each (7103-7105)
+#   benchmarks/local_redis.sh stop       stop every process started here
+#
+# Prints the environment to run the tests (python -m pytest) or the app with.
+# Needs redis-server and redis-cli on the PATH; data lives in $REDIS_DIR.
+
+set -e
+
+REDIS_DIR=${REDIS_DIR:-/tmp/pace-redis}
+mkdir -p "$REDIS_DIR"
+
+start() {
+    local port=$1
+    shift
+    redis-server --port "$port" --daemonize yes --dir "$REDIS_DIR" --save '' --appendonly no \
+        --maxmemory 512mb --maxmemory-policy allkeys-lru \
+        --pidfile "$REDIS_DIR/redis-$port.pid" --logfile "$REDIS_DIR/redis-$port.log" "$@"
+}
+
+wait_for() {
+    until redis-cli -p "$1" ping >/dev/null 2>&1; do sleep 0.1; done
+}
+
+case "$1" in
+    replicas)
+        start 7000
+        wait_for 7000
+        for port in 7001 7002; do
+            start "$port" --replicaof 127.0.0.1 7000
+            wait_for "$port"
+        done
+        echo "export REDIS_URL=redis://127.0.0.1:7000/0"
+        echo "export REDIS_REPLICA_URLS=redis://127.0.0.1:7001/0,redis://127.0.0.1:7002/0"
+        ;;
+    cluster)
+        nodes=()
+        for port in 7100 7101 7102 7103 7104 7105; do
+            start "$port" --cluster-enabled yes --cluster-config-file "nodes-$port.conf"
+            wait_for "$port"
+            nodes+=("127.0.0.1:$port")
+        done
+        redis-cli --cluster create "${nodes[@]}" --cluster-replicas 1 --cluster-yes >/dev/null
+        until redis-cli -p 7100 cluster info | grep -q 'cluster_state:ok'; do sleep 0.2; done
+        echo "export REDIS_URL=redis://127.0.0.1:7100"
+        echo "export REDIS_CLUSTER=true REDIS_READ_FROM_REPLICAS=true"
+        ;;
+    stop)
+        for pidfile in "$REDIS_DIR"/redis-*.pid; do
+            [ -e "$pidfile" ] && kill "$(cat "$pidfile")" 2>/dev/null || true
+        done
+        rm -f "$REDIS_DIR"/nodes-*.conf
+        ;;
+    *)
+        echo "usage: $0 replicas|cluster|stop" >&2
+        exit 1
+        ;;
+esac
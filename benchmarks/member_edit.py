@@ -0,0 +1,133 @@
+"""
+Cost of a member edit on a roster with a ~5,000-member eligible category.
+
+    python benchmarks/member_edit.py                      # in-memory session store
+    SESSION_STORE=redis REDIS_URL=redis://host:6379/0 python benchmarks/member_edit.py --edits 500
+
+encode - the fields an edit can write (categories, overlays, members when the
+         edit journal is compacted), staged and encoded:
+           walk  copied through a recursive sanitizer first (pd.isna and
+                 isoformat checks on every value), as SessionTransaction.update
+                 did for every staged value
+           hook  encoded as they are; orjson's default hook makes the values
+                 that are not JSON-ready so (_encode_field)
+app    - PUT /api/roster/member through the app, --edits times on one session,
+         with the per-phase times the session metrics (GET /api/metrics) recorded
+
+The app run uses SESSION_STORE (default memory here, so no Redis is needed).
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from datetime import datetime
+
+from roster_data import make_roster
+
+os.environ.setdefault("SESSION_STORE", "memory")
+
+import httpx
+import pandas as pd
+
+import main
+from constants import MEMBER_KEY_COLUMN
+from member_index import build_member_keys
+from roster_processor import classify_roster, session_fields_from_result
+from session_manager import _encode_field
+from session_metrics import metrics_snapshot
+
+EDIT_ENDPOINT = 'PUT /api/roster/member/{session_id}/{member_id}'
+
+
+def sanitize_walk(obj):
+    """The recursive sanitizer staged values used to go through."""
+    if isinstance(obj, dict):
+        return {k: sanitize_walk(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [sanitize_walk(item) for item in obj]
+    elif pd.isna(obj):
+        return None
+    elif isinstance(obj, (pd.Timestamp, datetime)):
+        return obj.isoformat()
+    elif hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return obj
+
+
+def median_ms(function, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def bench_encode(args):
+    logger = logging.getLogger('benchmark')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    roster_df = make_roster(args.rows, args.cycle)
+    roster_df[MEMBER_KEY_COLUMN] = build_member_keys(roster_df)
+    fields = session_fields_from_result(roster_df, classify_roster(roster_df, args.cycle, args.year, logger))
+    print(f"{args.rows} roster rows, {len(fields['categories']['eligible'])} eligible, median of {args.repeat} runs")
+    print(f"{'field':<12} {'walk ms':>10} {'hook ms':>10}")
+    for field in ('categories', 'overlays', 'members'):
+        value = fields[field]
+        walk = median_ms(lambda: _encode_field(sanitize_walk(value)), args.repeat)
+        hook = median_ms(lambda: _encode_field(value), args.repeat)
+        print(f"{field:<12} {walk:>10.2f} {hook:>10.2f}")
+    return roster_df
+
+
+async def bench_app(args, roster_df):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark', timeout=None) as client:
+        response = await client.post('/api/upload/initial-mel',
+                                     files={'file': ('roster.csv', roster_df.drop(columns=[MEMBER_KEY_COLUMN])
+                                                     .to_csv(index=False).encode(), 'text/csv')},
+                                     data={'cycle': args.cycle, 'year': str(args.year)})
+        response.raise_for_status()
+        session_id = response.json()['session_id']
+        preview = (await client.get(f'/api/roster/preview/{session_id}',
+                                    params={'category': 'eligible', 'page_size': 100})).json()
+        member_ids = [member['member_id'] for member in preview['categories']['eligible']]
+
+        latencies = []
+        for edit in range(args.edits):
+            started = time.perf_counter()
+            response = await client.put(f'/api/roster/member/{session_id}/{member_ids[edit % len(member_ids)]}',
+                                        json={'DAFSC': f"{10000 + edit}"})
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    latencies.sort()
+    print(f"\napp ({os.environ['SESSION_STORE']} store): {args.edits} edits")
+    print(f"  median {statistics.median(latencies) * 1000:.2f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.2f} ms")
+    histograms = metrics_snapshot()['endpoints'][EDIT_ENDPOINT]
+    count = histograms['duration_ms']['count']
+    for name in ('duration_ms', 'decrypt_ms', 'json_decode_ms', 'sanitize_ms', 'json_encode_ms', 'encrypt_ms'):
+        print(f"  {name:<16} {histograms[name]['sum'] / count:>8.2f} ms/edit")
+    for name in ('bytes_read', 'bytes_written', 'round_trips'):
+        print(f"  {name:<16} {histograms[name]['sum'] / count:>10,.0f} /edit")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=11500)
+    parser.add_argument('--cycle', default='SSG')
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--edits', type=int, default=200)
+    args = parser.parse_args()
+
+    roster_df = bench_encode(args)
+    asyncio.run(bench_app(args, roster_df))
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,79 @@
+"""
+Preview latency with and without the per-worker session cache.
+
+    REDIS_URL=redis://host:6379/0 python benchmarks/preview_cache.py
+    python benchmarks/preview_cache.py --rows 5000 --sessions 4 --requests 400 --edit-ratio 0.05
+
+Uploads --sessions synthetic rosters through the app, then sends --requests
+GET /api/roster/preview requests for random sessions, one at a time,
+interleaved with member edits in the ratio given by --edit-ratio (every edit
+makes the next preview of that session a miss). The run is made with the
+cache disabled and enabled; the cache statistics are those /api/health reports.
+
+Needs a real Redis server.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from roster_data import make_roster
+
+import httpx
+
+import main
+from session_cache import session_cache
+from session_concurrency import upload_roster
+
+
+async def run_traffic(client, sessions, requests, edit_ratio, seed):
+    rnd = random.Random(seed)
+    latencies = []
+    for _ in range(requests):
+        session_id, member_ids = rnd.choice(sessions)
+        if rnd.random() < edit_ratio:
+            await client.put(f'/api/roster/member/{session_id}/{rnd.choice(member_ids)}',
+                             json={'DAFSC': f"{rnd.randint(10000, 99999)}"})
+        started = time.perf_counter()
+        response = await client.get(f'/api/roster/preview/{session_id}')
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return latencies
+
+
+async def run(args):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+        sessions = [await upload_roster(client, args.rows, args.cycle, args.year, seed)
+                    for seed in range(args.sessions)]
+        print(f"{args.sessions} sessions of {args.rows} uploaded rows; "
+              f"{args.requests} previews, {args.edit_ratio:.0%} preceded by an edit")
+
+        max_bytes = session_cache.max_bytes
+        for label, limit in (('no cache', 0), ('cache', max_bytes)):
+            session_cache.max_bytes = limit
+            session_cache.clear()
+            latencies = sorted(await run_traffic(client, sessions, args.requests, args.edit_ratio, args.seed))
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(f"  {label:<9} preview p50 {statistics.median(latencies) * 1000:7.2f} ms "
+                  f"p95 {p95 * 1000:7.2f} ms")
+        print(f"  cache stats {(await client.get('/api/health')).json()['session_cache']}")
+        session_cache.max_bytes = max_bytes
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--cycle', default='SSG')
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--sessions', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--edit-ratio', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,105 @@
+"""
+A roster cleanup of many member edits and deletes, one request per change
+against one POST /api/roster/batch request.
+
+    python benchmarks/roster_batch.py                      # in-memory session store
+    SESSION_STORE=redis REDIS_URL=redis://host:6379/0 python benchmarks/roster_batch.py --operations 500
+
+Both runs start from the same upload and apply the same operations (--operations,
+about one delete for every five edits); the preview is compared afterwards.
+Round trips are counted by the Redis store only (see session_metrics.py).
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from roster_data import make_roster
+
+os.environ.setdefault("SESSION_STORE", "memory")
+
+import httpx
+
+import main
+from session_metrics import metrics_snapshot
+
+SINGLE_ENDPOINTS = ('PUT /api/roster/member/{session_id}/{member_id}',
+                    'DELETE /api/roster/member/{session_id}/{member_id}')
+BATCH_ENDPOINT = 'POST /api/roster/batch/{session_id}'
+
+
+def round_trips(endpoints):
+    histograms = metrics_snapshot()['endpoints']
+    return sum(histograms[endpoint]['round_trips']['sum'] for endpoint in endpoints if endpoint in histograms)
+
+
+async def upload(client, contents, args):
+    response = await client.post('/api/upload/initial-mel',
+                                 files={'file': ('roster.csv', contents, 'text/csv')},
+                                 data={'cycle': args.cycle, 'year': str(args.year)})
+    response.raise_for_status()
+    return response.json()['session_id']
+
+
+async def preview(client, session_id):
+    response = await client.get(f'/api/roster/preview/{session_id}', params={'page_size': 1000})
+    response.raise_for_status()
+    return response.json()
+
+
+def plan_operations(member_ids, count):
+    operations = []
+    for number, member_id in enumerate(member_ids[:count]):
+        if number % 6 == 5:
+            operations.append({'op': 'delete', 'member_id': member_id, 'reason': 'Benchmark cleanup'})
+        else:
+            operations.append({'op': 'edit', 'member_id': member_id, 'data': {'DAFSC': f"{20000 + number}"}})
+    return operations
+
+
+async def run(args):
+    contents = make_roster(args.rows, args.cycle).to_csv(index=False).encode()
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark', timeout=None) as client:
+        single_session, batch_session = await upload(client, contents, args), await upload(client, contents, args)
+        eligible = (await preview(client, single_session))['categories']['eligible']
+        operations = plan_operations([member['member_id'] for member in eligible], args.operations)
+
+        started = time.perf_counter()
+        for operation in operations:
+            if operation['op'] == 'edit':
+                response = await client.put(f"/api/roster/member/{single_session}/{operation['member_id']}",
+                                            json=operation['data'])
+            else:
+                response = await client.delete(f"/api/roster/member/{single_session}/{operation['member_id']}",
+                                               params={'reason': operation['reason']})
+            response.raise_for_status()
+        single_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        response = await client.post(f'/api/roster/batch/{batch_session}', json={'operations': operations})
+        response.raise_for_status()
+        batch_seconds = time.perf_counter() - started
+
+        single_preview, batch_preview = await preview(client, single_session), await preview(client, batch_session)
+
+    print(f"{args.rows} roster rows, {len(operations)} operations ({os.environ['SESSION_STORE']} store)")
+    print(f"  one request each  {single_seconds * 1000:>10.1f} ms  {round_trips(SINGLE_ENDPOINTS):>6.0f} round trips")
+    print(f"  one batch         {batch_seconds * 1000:>10.1f} ms  {round_trips([BATCH_ENDPOINT]):>6.0f} round trips")
+    same = all(single_preview[key] == batch_preview[key]
+               for key in ('statistics', 'categories', 'pascodes', 'senior_rater_needed'))
+    print(f"  same roster afterwards: {same}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--cycle', default='SSG')
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--operations', type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main_cli()
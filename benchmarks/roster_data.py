@@ -0,0 +1,60 @@
+"""
+Synthetic roster generator shared by the benchmark scripts.
+
+Rows look like a real alpha roster export (upper-case columns, DD-MMM-YYYY
+dates, PASCODEs spread across ~50 units) so classification exercises the
+same board_filter paths as production data. No real member data is used.
+"""
+import os
+import sys
+import random
+import pandas as pd
+from datetime import datetime, timedelta
+
+# Benchmarks run from the repo root or from benchmarks/ - make the flat modules importable
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# The default (Redis) session store needs a REDIS_URL; the benchmarks that don't
+# talk to it never open a connection
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+
+GRADES = ['SRA', 'SSG', 'TSG', 'A1C', 'MSG', 'SMS', 'CPT']
+LAST_NAMES = ['SMITH', 'JOHNSON', 'WILLIAMS', 'BROWN', 'JONES', 'GARCIA', 'MILLER', 'DAVIS',
+              'RODRIGUEZ', 'MARTINEZ', 'HERNANDEZ', 'LOPEZ', 'WILSON', 'ANDERSON', 'THOMAS']
+FIRST_NAMES = ['JAMES', 'MARY', 'ROBERT', 'PATRICIA', 'JOHN', 'JENNIFER', 'MICHAEL', 'LINDA',
+               'DAVID', 'ELIZABETH', 'WILLIAM', 'BARBARA', 'RICHARD', 'SUSAN', 'JOSEPH']
+
+
+def _date(rnd: random.Random, start: datetime, span_days: int) -> str:
+    return (start + timedelta(days=rnd.randint(0, span_days))).strftime('%d-%b-%Y').upper()
+
+
+def make_roster(rows: int = 50000, cycle: str = 'SSG', seed: int = 2025) -> pd.DataFrame:
+    """Build a normalized roster DataFrame with every required and optional column."""
+    rnd = random.Random(seed)
+    records = []
+    for i in range(rows):
+        grade = cycle if i % 3 == 0 else rnd.choice(GRADES)
+        pascode = f"AB{rnd.randint(10, 14):02d}FG{rnd.randint(0, 9)}"
+        records.append({
+            'FULL_NAME': f"{rnd.choice(LAST_NAMES)}, {rnd.choice(FIRST_NAMES)} {chr(65 + i % 26)}",
+            'GRADE': grade,
+            'ASSIGNED_PAS_CLEARTEXT': f"{pascode} SQUADRON",
+            'DAFSC': rnd.choice(['3D173', '3D153', '1N071', '2A573']),
+            'DOR': _date(rnd, datetime(2019, 1, 1), 1500),
+            'DATE_ARRIVED_STATION': _date(rnd, datetime(2018, 1, 1), 2600),
+            'TAFMSD': _date(rnd, datetime(2006, 1, 1), 5000),
+            'REENL_ELIG_STATUS': rnd.choice(['1A', '1A', '1A', '2X']),
+            'ASSIGNED_PAS': pascode,
+            'PAFSC': rnd.choice(['3D173', '3D153', '3D133', '1N071']),
+            'GRADE_PERM_PROJ': None,
+            'UIF_CODE': rnd.choice([0, 0, 0, 3]),
+            'UIF_DISPOSITION_DATE': '01-DEC-2025',
+            '2AFSC': None,
+            '3AFSC': None,
+            '4AFSC': None,
+            'SSAN': f"{100000000 + i}",
+        })
+    return pd.DataFrame(records)
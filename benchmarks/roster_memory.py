@@ -0,0 +1,74 @@
+"""
+Peak memory of the roster upload pipeline on a synthetic roster (tracemalloc).
+
+    python benchmarks/roster_memory.py                 # 50,000 rows, SSG 2025
+    python benchmarks/roster_memory.py --rows 10000 --cycle TSG
+
+Phases measured separately (peak is relative to the memory in use when the
+phase starts, so the input roster itself is not counted):
+
+    ingest    - column selection for processed_df, as in process_roster_upload
+    classify  - classify_roster plus building the session's member table,
+                category id lists and overlays, as roster_session_fields does
+
+No Redis connection is made.
+"""
+import argparse
+import gc
+import logging
+import time
+import tracemalloc
+
+from roster_data import make_roster
+
+from constants import REQUIRED_COLUMNS, OPTIONAL_COLUMNS, MEMBER_KEY_COLUMN
+from member_index import build_member_keys
+from roster_processor import classify_roster, session_fields_from_result
+
+
+def ingest_phase(df):
+    return df[[col for col in REQUIRED_COLUMNS + OPTIONAL_COLUMNS + [MEMBER_KEY_COLUMN] if col in df.columns]]
+
+
+def classify_phase(processed_df, cycle, year, logger):
+    result = classify_roster(processed_df, cycle, year, logger)
+    fields = session_fields_from_result(processed_df, result)
+    return len(fields['members']['ids']), sum(len(ids) for ids in fields['categories'].values())
+
+
+def measure(label, fn, *args):
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    value = fn(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<10} peak {(peak - base) / 1024 / 1024:8.1f} MB   {elapsed:7.2f} s", flush=True)
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--cycle', default='SSG')
+    parser.add_argument('--year', type=int, default=2025)
+    args = parser.parse_args()
+
+    # Per-member decisions are not part of the measurement
+    logger = logging.getLogger('benchmark')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    df = make_roster(args.rows, args.cycle)
+    df[MEMBER_KEY_COLUMN] = build_member_keys(df)
+    print(f"Roster: {len(df)} rows x {len(df.columns)} columns, {args.cycle} {args.year}")
+
+    processed_df = measure('ingest', ingest_phase, df)
+    members, listed = measure('classify', classify_phase, processed_df, args.cycle, args.year, logger)
+    print(f"  {members} members in the table, {listed} category entries")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Request throughput of one worker under concurrent preview and edit traffic.
+
+    REDIS_URL=redis://host:6379/0 python benchmarks/session_concurrency.py
+    python benchmarks/session_concurrency.py --clients 32 --requests 2000 --edit-ratio 0.3
+
+Uploads --sessions synthetic rosters through the app, then drives the
+FastAPI app in-process (one event loop, as in one uvicorn worker) with
+--clients concurrent clients, each sending GET /api/roster/preview or
+PUT /api/roster/member requests for a random session in the ratio given by
+--edit-ratio. The run is made twice against the same Redis:
+
+    blocking - session transactions use the synchronous client on the event
+               loop, as request handlers did before (every Redis call stalls
+               all other requests)
+    async    - AsyncSessionTransaction on the redis.asyncio pool
+
+Needs a real Redis server; the gap grows with network latency to Redis.
+Edits that lose a version race are retried by the app, and 409s are counted.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import Counter
+
+from roster_data import make_roster
+
+import httpx
+
+import main
+from session_manager import AsyncSessionTransaction, SessionTransaction
+
+
+class BlockingSessionTransaction(SessionTransaction):
+    """The previous request path: synchronous Redis calls made on the event loop."""
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+async def upload_roster(client, rows, cycle, year, seed):
+    contents = make_roster(rows, cycle, seed=seed).to_csv(index=False).encode()
+    response = await client.post('/api/upload/initial-mel',
+                                 files={'file': ('roster.csv', contents, 'text/csv')},
+                                 data={'cycle': cycle, 'year': str(year)})
+    response.raise_for_status()
+    session_id = response.json()['session_id']
+    preview = (await client.get(f'/api/roster/preview/{session_id}')).json()
+    member_ids = [member['member_id'] for member in preview['categories']['eligible']]
+    return session_id, member_ids
+
+
+async def run_traffic(client, sessions, clients, requests, edit_ratio, seed):
+    rnd = random.Random(seed)
+    plan = ['edit' if rnd.random() < edit_ratio else 'preview' for _ in range(requests)]
+    queue = asyncio.Queue()
+    for kind in plan:
+        queue.put_nowait(kind)
+
+    latencies = {'preview': [], 'edit': []}
+    statuses = Counter()
+
+    async def worker(index):
+        worker_rnd = random.Random(seed + index)
+        while not queue.empty():
+            kind = queue.get_nowait()
+            session_id, member_ids = worker_rnd.choice(sessions)
+            started = time.perf_counter()
+            if kind == 'edit':
+                member_id = worker_rnd.choice(member_ids)
+                response = await client.put(f'/api/roster/member/{session_id}/{member_id}',
+                                            json={'DAFSC': f"{worker_rnd.randint(10000, 99999)}"})
+            else:
+                response = await client.get(f'/api/roster/preview/{session_id}')
+            latencies[kind].append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(clients)))
+    return time.perf_counter() - started, latencies, statuses
+
+
+def report(label, elapsed, latencies, statuses, requests):
+    print(f"  {label:<9} {requests / elapsed:8.1f} req/s", end='')
+    for kind in ('preview', 'edit'):
+        times = sorted(latencies[kind])
+        if times:
+            p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+            print(f"   {kind} p50 {statistics.median(times) * 1000:7.1f} ms p95 {p95 * 1000:7.1f} ms", end='')
+    print(f"   status {dict(sorted(statuses.items()))}", flush=True)
+
+
+async def run(args):
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://benchmark') as client:
+        sessions = [await upload_roster(client, args.rows, args.cycle, args.year, seed)
+                    for seed in range(args.sessions)]
+        print(f"{args.sessions} sessions of {args.rows} uploaded rows; "
+              f"{args.clients} clients, {args.requests} requests, {args.edit_ratio:.0%} edits")
+
+        for label, transaction in (('blocking', BlockingSessionTransaction), ('async', AsyncSessionTransaction)):
+            main.AsyncSessionTransaction = transaction
+            # Warm up connections and the compare-and-set script
+            await run_traffic(client, sessions, args.clients, args.clients, args.edit_ratio, 0)
+            elapsed, latencies, statuses = await run_traffic(
+                client, sessions, args.clients, args.requests, args.edit_ratio, args.seed)
+            report(label, elapsed, latencies, statuses, args.requests)
+        main.AsyncSessionTransaction = AsyncSessionTransaction
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=300)
+    parser.add_argument('--cycle', default='SSG')
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--sessions', type=int, default=8)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--edit-ratio', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main_cli()
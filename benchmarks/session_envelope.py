@@ -0,0 +1,103 @@
+"""
+Size and encode/decode time of session values, v1 vs v2 envelope.
+
+    python benchmarks/session_envelope.py              # 10,000-row roster
+    python benchmarks/session_envelope.py --rows 50000 --level 6
+
+v1: json.dumps -> Fernet (AES-CBC + HMAC, base64 text), with a Fernet object
+    built per call as before; PDFs were base64-encoded before encryption.
+v2: orjson -> zlib (values >= SESSION_COMPRESSION_MIN_BYTES) -> AES-GCM
+    with the cached cipher, stored as raw bytes; PDFs are not compressed.
+
+Payloads are a full roster as records, one category of ~1/3 of it, a
+scalar field and 1 MB of incompressible bytes standing in for a PDF.
+No Redis connection is made.
+"""
+import argparse
+import base64
+import json
+import os
+import statistics
+import time
+
+from roster_data import make_roster
+
+import constants
+import session_manager
+from cryptography.fernet import Fernet
+from session_manager import dataframe_to_records, _get_encryption_key, _encode_field, _decode_field, seal, unseal
+
+
+def v1_encode(value):
+    return Fernet(_get_encryption_key()).encrypt(json.dumps(value).encode()).decode()
+
+
+def v1_decode(token):
+    return json.loads(Fernet(_get_encryption_key()).decrypt(token.encode()))
+
+
+def v1_encode_pdf(data):
+    return Fernet(_get_encryption_key()).encrypt(base64.b64encode(data)).decode()
+
+
+def v1_decode_pdf(token):
+    return base64.b64decode(Fernet(_get_encryption_key()).decrypt(token.encode()))
+
+
+def timed(fn, arg, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(arg)
+        times.append(time.perf_counter() - started)
+    return result, statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--level', type=int, default=constants.SESSION_COMPRESSION_LEVEL,
+                        help='zlib level for v2 (default: SESSION_COMPRESSION_LEVEL)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    session_manager.SESSION_COMPRESSION_LEVEL = args.level
+
+    records = dataframe_to_records(make_roster(args.rows, 'SSG'))
+    payloads = [
+        ('roster', records),
+        ('category', records[:len(records) // 3]),
+        ('cycle', 'SSG'),
+    ]
+    pdf = os.urandom(1024 * 1024)
+
+    print(f"{args.rows} roster rows, zlib level {args.level}, median of {args.repeat} runs")
+    print(f"{'value':<12} {'':>3} {'size':>12} {'encode ms':>10} {'decode ms':>10}")
+
+    def report(name, version, encoded, encode_ms, decode_ms):
+        print(f"{name:<12} {version:>3} {len(encoded):>12,} {encode_ms:>10.2f} {decode_ms:>10.2f}")
+
+    for name, value in payloads:
+        encoded, encode_ms = timed(v1_encode, value, args.repeat)
+        decoded, decode_ms = timed(v1_decode, encoded, args.repeat)
+        assert decoded == value
+        report(name, 'v1', encoded, encode_ms, decode_ms)
+
+        encoded, encode_ms = timed(_encode_field, value, args.repeat)
+        decoded, decode_ms = timed(_decode_field, encoded, args.repeat)
+        assert decoded == value
+        report('', 'v2', encoded, encode_ms, decode_ms)
+
+    encoded, encode_ms = timed(v1_encode_pdf, pdf, args.repeat)
+    decoded, decode_ms = timed(v1_decode_pdf, encoded, args.repeat)
+    assert decoded == pdf
+    report('pdf (1 MB)', 'v1', encoded, encode_ms, decode_ms)
+
+    encoded, encode_ms = timed(lambda data: seal(data, compress=False), pdf, args.repeat)
+    decoded, decode_ms = timed(unseal, encoded, args.repeat)
+    assert decoded == pdf
+    report('', 'v2', encoded, encode_ms, decode_ms)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Size and encode/decode time of a session's roster, per-category records vs
+the member table.
+
+    python benchmarks/session_layout.py              # 10,000-row roster
+    python benchmarks/session_layout.py --rows 50000 --cycle TSG
+
+records - the previous layout: the upload as records ('dataframe' and
+          'pdf_dataframe') plus one record list per category, so a member
+          is stored up to five times
+table   - members (one column-oriented table), categories (id lists),
+          overlays (REASON and soft deletes) and member_index
+
+Each layout is encoded with _encode_field, one value per session field, as
+it is stored in Redis. 'edit' is the fields an edit rewrites: a category and
+pdf_dataframe before, members and overlays now. No Redis connection is made.
+"""
+import argparse
+import logging
+import statistics
+import time
+
+from roster_data import make_roster
+
+from constants import MEMBER_KEY_COLUMN, PDF_COLUMNS, ROSTER_CATEGORIES
+from member_index import build_member_index, build_member_keys
+from roster_processor import classify_roster, session_fields_from_result
+from session_manager import dataframe_to_records, _encode_field, _decode_field
+
+
+def records_layout(roster_df, result):
+    fields = {
+        'dataframe': dataframe_to_records(roster_df),
+        'pdf_dataframe': dataframe_to_records(roster_df[PDF_COLUMNS + [MEMBER_KEY_COLUMN]]),
+        'member_index': build_member_index(roster_df[MEMBER_KEY_COLUMN]),
+    }
+    for category in ROSTER_CATEGORIES:
+        labels = result['members'][category]
+        df = result['roster'].loc[labels]
+        if category in ('ineligible', 'discrepancy'):
+            df['REASON'] = df.index.map(result['reasons'])
+        fields[f'{category}_df'] = dataframe_to_records(df)
+    return fields
+
+
+def table_layout(roster_df, result):
+    fields = session_fields_from_result(roster_df, result)
+    return {key: fields[key] for key in ('members', 'categories', 'overlays', 'member_index')}
+
+
+def measure(fields, repeat):
+    """Total encoded size, median encode and decode ms of all fields."""
+    encode_times, decode_times = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        encoded = {key: _encode_field(value) for key, value in fields.items()}
+        encode_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        for raw in encoded.values():
+            _decode_field(raw)
+        decode_times.append(time.perf_counter() - started)
+    size = sum(len(raw) for raw in encoded.values())
+    return size, statistics.median(encode_times) * 1000, statistics.median(decode_times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--cycle', default='SSG')
+    parser.add_argument('--year', type=int, default=2025)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    logger = logging.getLogger('benchmark')
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    roster_df = make_roster(args.rows, args.cycle)
+    roster_df[MEMBER_KEY_COLUMN] = build_member_keys(roster_df)
+    result = classify_roster(roster_df, args.cycle, args.year, logger)
+
+    layouts = [('records', records_layout(roster_df, result), ['eligible_df', 'pdf_dataframe']),
+               ('table', table_layout(roster_df, result), ['members', 'overlays'])]
+
+    print(f"{args.rows} roster rows, {args.cycle} {args.year}, median of {args.repeat} runs")
+    print(f"{'layout':<8} {'':<6} {'size':>12} {'encode ms':>10} {'decode ms':>10}")
+    for name, fields, edit_fields in layouts:
+        for label, subset in (('all', fields), ('edit', {key: fields[key] for key in edit_fields})):
+            size, encode_ms, decode_ms = measure(subset, args.repeat)
+            print(f"{name:<8} {label:<6} {size:>12,} {encode_ms:>10.2f} {decode_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
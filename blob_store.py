@@ -0,0 +1,112 @@
+import hashlib
+import hmac
+from functools import lru_cache
+from typing import Iterable, Optional
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from session_manager import seal, unseal, _get_encryption_key
+from session_metrics import count_bytes_read, count_bytes_written
+from session_store import get_session_store
+
+
+# =============================================================================
+# BLOB STORE - logos and generated PDFs, encrypted and content-addressed
+# =============================================================================
+#
+# Each blob is kept once in the session store, as digest -> bytes in a v2
+# envelope (not compressed: images and PDFs already are), however many sessions
+# use it. A session references its blobs by role ("logo", "pdf"); the session
+# data itself only keeps the digest next to the logo's filename and content type.
+#
+# digest is a keyed SHA-256 (HMAC with a key derived from the session encryption
+# key), so equal content from two sessions is stored once while the address
+# reveals nothing about the content to anyone without the key. The digest is
+# also the ETag of GET /api/roster/logo.
+#
+# Blobs are never deleted explicitly - another session may reference the same
+# digest. Every put and every TTL refresh of a referencing session (see
+# refresh_blob_ttls) extends a blob to session_ttl, so it expires session_ttl
+# after the last session that uses it.
+
+LOGO_BLOB = "logo"
+PDF_BLOB = "pdf"
+
+
+@lru_cache(maxsize=None)
+def _get_digest_key() -> bytes:
+    """HMAC key for blob addresses, derived from the session encryption key (once per process)."""
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=None,
+                info=b"pace-blob-address").derive(_get_encryption_key())
+
+
+def blob_digest(data: bytes) -> str:
+    return hmac.new(_get_digest_key(), data, hashlib.sha256).hexdigest()
+
+
+def _open_blob(stored: Optional[bytes]) -> Optional[bytes]:
+    if not stored:
+        return None
+    count_bytes_read(len(stored))
+    return unseal(stored)
+
+
+def _seal_blob(data: bytes) -> bytes:
+    sealed = seal(data, compress=False)
+    count_bytes_written(len(sealed))
+    return sealed
+
+
+def put_blob(session_id: str, role: str, data: bytes) -> str:
+    """
+    Store data as the session's blob for role (replacing any previous one)
+    and return its digest. Content already in the store is not written again.
+    """
+    digest = blob_digest(data)
+    store = get_session_store()
+    if not store.ref_blob(session_id, role, digest):
+        store.set_blob(digest, _seal_blob(data))
+    return digest
+
+
+async def async_put_blob(session_id: str, role: str, data: bytes) -> str:
+    """asyncio version of put_blob."""
+    digest = blob_digest(data)
+    store = get_session_store()
+    if not await store.async_ref_blob(session_id, role, digest):
+        await store.async_set_blob(digest, _seal_blob(data))
+    return digest
+
+
+def get_blob(digest: str) -> Optional[bytes]:
+    """Decrypted content of a blob, or None once it expired."""
+    return _open_blob(get_session_store().get_blob(digest))
+
+
+async def async_get_blob(digest: str) -> Optional[bytes]:
+    """asyncio version of get_blob."""
+    return _open_blob(await get_session_store().async_get_blob(digest))
+
+
+def get_session_blob(session_id: str, role: str) -> Optional[bytes]:
+    """The session's blob for role, or None if it has none."""
+    digest = get_session_store().blob_ref(session_id, role)
+    return get_blob(digest) if digest else None
+
+
+async def async_get_session_blob(session_id: str, role: str) -> Optional[bytes]:
+    """asyncio version of get_session_blob."""
+    digest = await get_session_store().async_blob_ref(session_id, role)
+    return await async_get_blob(digest) if digest else None
+
+
+async def async_drop_blob(session_id: str, role: str) -> None:
+    """Remove the session's reference for role; the blob expires when no session refreshes it."""
+    await get_session_store().async_drop_blob_ref(session_id, role)
+
+
+async def refresh_blob_ttls(session_ids: Iterable[str]) -> int:
+    """
+    Extend the references and blobs of sessions whose TTL was just refreshed.
+    Returns the number of blobs extended.
+    """
+    return await get_session_store().async_refresh_blobs(list(session_ids))
@@ -0,0 +1,249 @@
+import os
+import json
+import asyncio
+import uuid
+import shutil
+import hashlib
+import time
+from typing import Optional, Dict, Any, Tuple
+from session_manager import _encrypt_data, _decrypt_data, encrypt_bytes, decrypt_bytes
+from session_store import get_session_store
+from constants import (
+    UPLOAD_CHUNK_SIZE_BYTES, MIN_UPLOAD_CHUNK_SIZE_BYTES, MAX_UPLOAD_CHUNK_SIZE_BYTES,
+    MAX_FILE_SIZE_MB, ALLOWED_FILE_EXTENSIONS, allowed_types,
+    DEFAULT_DUPLICATE_POLICY, DEFAULT_INVALID_ROW_ACTION, chunked_upload_dir,
+    CHUNKED_UPLOAD_COMPLETE_TIMEOUT_SECONDS
+)
+
+
+# =============================================================================
+# RESUMABLE CHUNKED UPLOADS
+# =============================================================================
+#
+# Upload state lives in the session store so any worker can accept any chunk:
+#   {upload_id}  meta      -> encrypted JSON (filename, cycle, sizes, ...)
+#                chunk:{n} -> SHA-256 of the plaintext chunk once received
+#                completing -> "<time>:<token>" while a /complete request ingests it
+# Chunk bodies are spooled to disk encrypted, one file per chunk index, so a
+# client that loses its connection only resends the chunks that are missing.
+# Completing an upload claims it with a compare-and-set on the completing field,
+# so two /complete requests never ingest the same upload twice.
+
+COMPLETING_FIELD = "completing"
+
+class ChunkedUploadError(Exception):
+    """Raised for invalid chunked upload operations. Carries an HTTP status code."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _spool_dir(upload_id: str) -> str:
+    return os.path.join(chunked_upload_dir, upload_id)
+
+
+def _chunk_path(upload_id: str, index: int) -> str:
+    return os.path.join(_spool_dir(upload_id), f"{index:05d}.part")
+
+
+def _validate_upload_id(upload_id: str) -> None:
+    # Upload IDs are used in file paths - only accept our own UUIDs
+    try:
+        uuid.UUID(upload_id)
+    except (ValueError, AttributeError, TypeError):
+        raise ChunkedUploadError("Invalid upload_id", 400)
+
+
+def _expected_chunk_size(meta: Dict[str, Any], index: int) -> int:
+    if index < meta['total_chunks'] - 1:
+        return meta['chunk_size']
+    return meta['total_size'] - meta['chunk_size'] * (meta['total_chunks'] - 1)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_chunk(upload_id: str, index: int, data: bytes) -> None:
+    """Encrypt a chunk and spool it; the rename keeps a resent chunk from being read half-written."""
+    chunk_path = _chunk_path(upload_id, index)
+    os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+    temp_path = f"{chunk_path}.{uuid.uuid4().hex}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(encrypt_bytes(data))
+    os.replace(temp_path, chunk_path)
+
+
+def _read_chunks(upload_id: str, meta: Dict[str, Any]) -> bytes:
+    """Decrypt the spooled chunks in order and verify them against the recorded digests."""
+    file_hash = hashlib.sha256()
+    parts = []
+    for index in range(meta['total_chunks']):
+        try:
+            with open(_chunk_path(upload_id, index), 'rb') as f:
+                data = decrypt_bytes(f.read())
+        except Exception:
+            raise ChunkedUploadError(f"Chunk {index} is unreadable, please resend it", 409)
+        if hashlib.sha256(data).hexdigest() != meta['chunk_digests'][index]:
+            raise ChunkedUploadError(f"Chunk {index} failed verification, please resend it", 409)
+        file_hash.update(data)
+        parts.append(data)
+
+    if meta.get('sha256') and file_hash.hexdigest() != meta['sha256']:
+        raise ChunkedUploadError("Checksum mismatch for assembled file", 422)
+
+    return b"".join(parts)
+
+
+async def initiate_upload(filename: str, content_type: str, total_size: int, cycle: str, year: int,
+                    mel_type: str = 'initial', all_sheets: bool = False,
+                    duplicate_policy: str = DEFAULT_DUPLICATE_POLICY,
+                    invalid_rows: str = DEFAULT_INVALID_ROW_ACTION, chunk_size: Optional[int] = None,
+                    sha256: Optional[str] = None) -> Dict[str, Any]:
+    """Register a new resumable upload and return its identifier and chunk layout."""
+    if content_type not in allowed_types:
+        raise ChunkedUploadError("Invalid file type. Only CSV or Excel files are allowed.")
+
+    if not any(filename.endswith(ext) for ext in ALLOWED_FILE_EXTENSIONS):
+        raise ChunkedUploadError("Unsupported file extension.")
+
+    max_size_bytes = MAX_FILE_SIZE_MB * 1024 * 1024
+    if total_size <= 0:
+        raise ChunkedUploadError("total_size must be greater than zero")
+    if total_size > max_size_bytes:
+        raise ChunkedUploadError(f"File too large. Maximum size is {MAX_FILE_SIZE_MB}MB")
+
+    chunk_size = chunk_size or UPLOAD_CHUNK_SIZE_BYTES
+    if not MIN_UPLOAD_CHUNK_SIZE_BYTES <= chunk_size <= MAX_UPLOAD_CHUNK_SIZE_BYTES:
+        raise ChunkedUploadError(
+            f"chunk_size must be between {MIN_UPLOAD_CHUNK_SIZE_BYTES} and {MAX_UPLOAD_CHUNK_SIZE_BYTES} bytes"
+        )
+
+    upload_id = str(uuid.uuid4())
+    meta = {
+        "filename": filename,
+        "content_type": content_type,
+        "total_size": total_size,
+        "chunk_size": chunk_size,
+        "total_chunks": (total_size + chunk_size - 1) // chunk_size,
+        "cycle": cycle,
+        "year": year,
+        "mel_type": mel_type,
+        "all_sheets": all_sheets,
+        "duplicate_policy": duplicate_policy,
+        "invalid_rows": invalid_rows,
+        "sha256": sha256.lower() if sha256 else None,
+    }
+
+    os.makedirs(_spool_dir(upload_id), exist_ok=True)
+
+    await get_session_store().async_set_upload_fields(upload_id, {"meta": _encrypt_data(json.dumps(meta))})
+
+    return {"upload_id": upload_id, **{k: meta[k] for k in ("chunk_size", "total_chunks", "total_size")}}
+
+
+async def get_upload(upload_id: str) -> Optional[Dict[str, Any]]:
+    """Return upload metadata plus the sorted list of received chunk indices, or None if expired."""
+    _validate_upload_id(upload_id)
+    state = await get_session_store().async_get_upload_fields(upload_id)
+    if not state or "meta" not in state:
+        return None
+
+    meta = json.loads(_decrypt_data(state["meta"]))
+    meta["received"] = sorted(int(field.split(":", 1)[1]) for field in state if field.startswith("chunk:"))
+    meta["chunk_digests"] = {int(field.split(":", 1)[1]): digest
+                             for field, digest in state.items() if field.startswith("chunk:")}
+    return meta
+
+
+async def store_chunk(upload_id: str, index: int, data: bytes,
+                expected_sha256: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Verify a single chunk and spool it to encrypted temp storage.
+    Re-sending a chunk that was already received overwrites it, so retries are safe.
+    """
+    meta = await get_upload(upload_id)
+    if not meta:
+        raise ChunkedUploadError("Upload not found or expired", 404)
+
+    if index < 0 or index >= meta['total_chunks']:
+        raise ChunkedUploadError(f"Chunk index {index} out of range (0-{meta['total_chunks'] - 1})")
+
+    expected_size = _expected_chunk_size(meta, index)
+    if len(data) != expected_size:
+        raise ChunkedUploadError(f"Chunk {index} has {len(data)} bytes, expected {expected_size}")
+
+    digest = await asyncio.to_thread(_sha256, data)
+    if expected_sha256 and expected_sha256.lower() != digest:
+        raise ChunkedUploadError(f"Checksum mismatch for chunk {index}", 422)
+
+    # Encryption and disk writes run in a thread, off the event loop
+    await asyncio.to_thread(_write_chunk, upload_id, index, data)
+
+    await get_session_store().async_set_upload_fields(upload_id, {f"chunk:{index}": digest})
+
+    received = set(meta['received']) | {index}
+    return {
+        "upload_id": upload_id,
+        "chunk_index": index,
+        "sha256": digest,
+        "received_chunks": len(received),
+        "total_chunks": meta['total_chunks'],
+    }
+
+
+async def assemble_upload(upload_id: str) -> Tuple[Dict[str, Any], bytes]:
+    """
+    Decrypt and concatenate all chunks in order, re-checking every chunk digest
+    and the whole-file SHA-256 (when one was supplied at initiate).
+    """
+    meta = await get_upload(upload_id)
+    if not meta:
+        raise ChunkedUploadError("Upload not found or expired", 404)
+
+    missing = [i for i in range(meta['total_chunks']) if i not in meta['chunk_digests']]
+    if missing:
+        raise ChunkedUploadError(f"Upload incomplete. Missing chunks: {missing[:20]}", 409)
+
+    # Reading, decrypting and hashing the whole file run in a thread, off the event loop
+    contents = await asyncio.to_thread(_read_chunks, upload_id, meta)
+    return meta, contents
+
+
+async def claim_upload(upload_id: str) -> str:
+    """
+    Mark an upload as being completed and return the claim to release it with.
+    A claim older than CHUNKED_UPLOAD_COMPLETE_TIMEOUT_SECONDS (its request died)
+    is taken over.
+
+    Raises:
+        ChunkedUploadError: 404 if the upload expired, 409 if another request is completing it
+    """
+    _validate_upload_id(upload_id)
+    store = get_session_store()
+    state = await store.async_get_upload_fields(upload_id)
+    if not state or "meta" not in state:
+        raise ChunkedUploadError("Upload not found or expired", 404)
+
+    current = state.get(COMPLETING_FIELD)
+    if current is not None and time.time() - float(current.split(":", 1)[0]) < CHUNKED_UPLOAD_COMPLETE_TIMEOUT_SECONDS:
+        raise ChunkedUploadError("Upload is already being completed", 409)
+
+    claim = f"{time.time():.3f}:{uuid.uuid4().hex}"
+    if not await store.async_swap_upload_field(upload_id, COMPLETING_FIELD, current, claim):
+        raise ChunkedUploadError("Upload is already being completed", 409)
+    return claim
+
+
+async def release_upload(upload_id: str, claim: str) -> None:
+    """Give up a claim from claim_upload, keeping the chunks so the upload can be completed again."""
+    await get_session_store().async_swap_upload_field(upload_id, COMPLETING_FIELD, claim, None)
+
+
+async def discard_upload(upload_id: str) -> None:
+    """Remove upload state and spooled chunks."""
+    _validate_upload_id(upload_id)
+    await get_session_store().async_delete_upload(upload_id)
+    await asyncio.to_thread(shutil.rmtree, _spool_dir(upload_id), ignore_errors=True)
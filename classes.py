@@ -1,5 +1,6 @@
-from typing import Dict
-from pydantic import BaseModel
+from typing import Any, Dict, List, Literal
+from pydantic import BaseModel, Field
+from constants import ROSTER_BATCH_MAX_OPERATIONS
 
 class PasCodeInfo(BaseModel):
     srid: str
@@ -17,3 +18,30 @@ class PasCodeInfo(BaseModel):
 class PasCodeSubmission(BaseModel):
     session_id: str
     pascode_info: Dict[str, PasCodeInfo]
+
+class ChunkedUploadInit(BaseModel):
+    filename: str
+    content_type: str
+    total_size: int
+    cycle: str
+    year: int
+    mel_type: Literal['initial', 'final'] = 'initial'
+    all_sheets: bool = False
+    duplicate_policy: str = 'keep_first'
+    invalid_rows: str = 'flag'
+    chunk_size: int | None = None
+    sha256: str | None = None
+
+class RosterOperation(BaseModel):
+    op: Literal['add', 'edit', 'delete']
+    member_id: str | None = None
+    # edit: the fields to change; add: the new member's fields
+    data: Dict[str, Any] = {}
+    category: str | None = None
+    reason: str | None = None
+    hard_delete: bool = False
+    senior_rater_info: Dict[str, Any] = {}
+
+class RosterBatch(BaseModel):
+    operations: List[RosterOperation] = Field(min_length=1, max_length=ROSTER_BATCH_MAX_OPERATIONS)
+    atomic: bool = False
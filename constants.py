@@ -31,12 +31,96 @@ allowed_types = [
     "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 ]
 
+# Debug response headers (ENABLE_DEBUG_HEADERS): Redis round trips, session bytes read and
+# written, and Server-Timing with the time spent decrypting, encrypting, parsing and sanitizing
+REDIS_ROUND_TRIPS_HEADER = "X-Redis-Round-Trips"
+SESSION_BYTES_HEADER = "X-Session-Bytes"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# Histogram buckets of the per-endpoint session metrics (GET /api/metrics, see session_metrics.py)
+METRICS_TIME_BUCKETS_MS = [0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+METRICS_BYTE_BUCKETS = [0, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216]
+METRICS_COUNT_BUCKETS = [0, 1, 2, 3, 4, 6, 8, 12, 16, 32]
+
 # ============================================================================
 # SESSION SETTINGS
 # ============================================================================
 
 session_ttl = 1800
 
+# Where sessions, blobs and chunked upload state are kept (see session_store.py):
+#   redis   REDIS_URL, shared by every worker and node (default)
+#   sqlite  one SQLite database in WAL mode at SESSION_SQLITE_PATH, shared by the
+#           workers of a single node
+#   memory  this process only - tests, benchmarks and single-process runs
+SESSION_STORE = os.getenv('SESSION_STORE', 'redis').lower()
+SESSION_SQLITE_PATH = os.getenv('SESSION_SQLITE_PATH', os.path.join('data', 'sessions.db'))
+
+# Redis connections, per worker. Async requests wait up to REDIS_POOL_TIMEOUT_SECONDS
+# for a free pooled connection rather than failing when all are busy.
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', '50'))
+REDIS_POOL_TIMEOUT_SECONDS = 5
+REDIS_SOCKET_TIMEOUT_SECONDS = 5
+REDIS_CONNECT_TIMEOUT_SECONDS = 2
+REDIS_HEALTH_CHECK_INTERVAL_SECONDS = 30
+
+# Redis topology (see redis_session_store.py). With REDIS_CLUSTER=true, REDIS_URL
+# names any node of a Redis Cluster and sessions are spread across its shards.
+# Read-only requests (roster preview, logo, downloads) can be served by replicas:
+# REDIS_REPLICA_URLS (comma-separated) for a single primary, or
+# REDIS_READ_FROM_REPLICAS=true for the replicas of each cluster shard.
+REDIS_CLUSTER = os.getenv('REDIS_CLUSTER', 'false').lower() == 'true'
+REDIS_REPLICA_URLS = [url.strip() for url in os.getenv('REDIS_REPLICA_URLS', '').split(',') if url.strip()]
+REDIS_READ_FROM_REPLICAS = os.getenv('REDIS_READ_FROM_REPLICAS', 'false').lower() == 'true'
+
+# Session values of at least this many bytes are zlib-compressed before encryption
+SESSION_COMPRESSION_MIN_BYTES = 1024
+SESSION_COMPRESSION_LEVEL = 1
+
+# Concurrent edits: commutative requests that lose a version race are re-run this
+# many times (with a short random backoff) before answering 409
+SESSION_CONFLICT_RETRIES = 3
+SESSION_CONFLICT_BACKOFF_SECONDS = 0.02
+
+# Roster edits are journaled (see edit_journal.py): the member table is written back
+# once this many entries are pending, and this many edits can be undone in a row
+JOURNAL_COMPACT_ENTRIES = 32
+JOURNAL_UNDO_LIMIT = 50
+
+# Most operations one POST /api/roster/batch request may carry
+ROSTER_BATCH_MAX_OPERATIONS = 1000
+
+# Members per category and page in GET /api/roster/preview (page_size), and the largest page served
+PREVIEW_PAGE_SIZE = 50
+PREVIEW_MAX_PAGE_SIZE = 1000
+
+# Roster categories; a session stores one member id list per category (see member_table.py)
+ROSTER_CATEGORIES = ['eligible', 'ineligible', 'discrepancy', 'btz', 'small_unit']
+
+# Layout of the data in a session hash. Sessions written with an older layout are
+# treated as expired (they live for session_ttl at most).
+SESSION_SCHEMA_VERSION = 2
+
+# Session lifecycle (see session_lifecycle.py). Reads keep a session alive: the TTL
+# of every session read is reset with EXPIRE, in batches, every interval below.
+SESSION_TTL_REFRESH_INTERVAL_SECONDS = 60
+# Redis memory is compared with the server's maxmemory (REDIS_MAXMEMORY_BYTES when it
+# reports none; docker-compose runs 512mb allkeys-lru, which evicts sessions when full).
+# Above the warn ratio a warning is logged; above the shed ratio new uploads are
+# refused with 503 until usage drops, so existing sessions are not evicted.
+REDIS_MEMORY_CHECK_INTERVAL_SECONDS = 30
+REDIS_MAXMEMORY_BYTES = 512 * 1024 * 1024
+REDIS_MEMORY_WARN_RATIO = 0.8
+REDIS_MEMORY_SHED_RATIO = 0.9
+# Files left under tmp/ by failed requests, and session logs, are removed once they
+# are this old (swept every SESSION_CLEANUP_INTERVAL when ENABLE_SESSION_CLEANUP is on)
+TMP_FILE_MAX_AGE_SECONDS = 3600
+SESSION_LOG_RETENTION_DAYS = 30
+
+# Decoded sessions kept per worker for read-only requests, in bytes of decrypted
+# JSON (see session_cache.py); 0 disables the cache
+SESSION_CACHE_MAX_BYTES = int(os.getenv('SESSION_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
 # ============================================================================
 # PATH SETTINGS
 # ============================================================================
@@ -72,7 +156,7 @@ ACCOUNTING_DATE_OFFSET_DAYS = 119
 # ============================================================================
 
 # Session validation
-SESSION_REQUIRED_KEYS = ['eligible_df', 'cycle', 'year', 'pascode_map']
+SESSION_REQUIRED_KEYS = ['members', 'categories', 'cycle', 'year', 'pascode_map']
 
 # Data validation
 DATA_VALIDATION_ERRORS = {
@@ -81,12 +165,32 @@ DATA_VALIDATION_ERRORS = {
     'DUPLICATE_ENTRIES': 'Duplicate personnel entries detected',
     'INVALID_DATE_FORMAT': 'Invalid date format detected',
     'INVALID_GRADE': 'Invalid military grade detected',
-    'MISSING_REQUIRED_DATA': 'Missing required data'
+    'MISSING_REQUIRED_DATA': 'Missing required data',
+    'INVALID_SERVICE_DATE': 'Service date outside valid range',
+    'INVALID_GRADE_TRANSITION': 'Projected grade is not the next grade',
+    'INVALID_AFSC': 'Invalid AFSC length',
+    'INVALID_NAME': 'Invalid member name'
 }
 
 # File processing
 MAX_FILE_SIZE_MB = 50
 ALLOWED_FILE_EXTENSIONS = ['.csv', '.xlsx']
+MAX_UPLOAD_FILES = 25  # Files per multi-file upload
+MAX_INGEST_WORKERS = 4  # Worker processes used to parse roster parts in parallel
+
+# Resumable chunked uploads
+UPLOAD_CHUNK_SIZE_BYTES = 2 * 1024 * 1024  # 2MB default chunk size
+MIN_UPLOAD_CHUNK_SIZE_BYTES = 256 * 1024  # 256KB
+MAX_UPLOAD_CHUNK_SIZE_BYTES = 8 * 1024 * 1024  # 8MB
+chunked_upload_ttl = 3600  # Incomplete uploads can be resumed for 1 hour
+chunked_upload_dir = os.path.join('tmp', 'uploads')
+# A /complete request holds its upload for this long; a claim left by a worker that died is taken over after it
+CHUNKED_UPLOAD_COMPLETE_TIMEOUT_SECONDS = 600
+
+# Duplicate member handling during upload
+DUPLICATE_POLICIES = ['keep_first', 'keep_latest_das', 'reject']
+DEFAULT_DUPLICATE_POLICY = 'keep_first'
+DUPLICATE_REPORT_LIMIT = 50  # Duplicate groups listed in the upload response
 
 # Redis/Session constants
 SESSION_ID_LENGTH = 36  # UUID4 length
@@ -180,6 +284,27 @@ NAME_VALIDATION = {
     'ALLOWED_CHARACTERS': r'^[A-Za-z\s\-\'\.]+$'
 }
 
+# Upload validation stage (roster_validation.py). 'error' rules mark a row as bad data;
+# 'warning' rules are reported only
+VALIDATION_RULE_SEVERITY = {
+    'MISSING_REQUIRED_DATA': 'error',
+    'INVALID_GRADE': 'error',
+    'INVALID_DATE_FORMAT': 'error',
+    'INVALID_SERVICE_DATE': 'error',
+    'INVALID_GRADE_TRANSITION': 'warning',
+    'INVALID_AFSC': 'warning',
+    'INVALID_NAME': 'warning'
+}
+VALIDATED_DATE_COLUMNS = ['DOR', 'TAFMSD', 'DATE_ARRIVED_STATION', 'UIF_DISPOSITION_DATE']
+AFSC_COLUMNS = ['DAFSC', 'PAFSC', '2AFSC', '3AFSC', '4AFSC']
+
+# What happens to rows that fail an 'error' rule:
+#   flag   - kept; in-cycle members are marked ineligible with the validation reason
+#   reject - removed before classification
+INVALID_ROW_ACTIONS = ['flag', 'reject']
+DEFAULT_INVALID_ROW_ACTION = 'flag'
+VALIDATION_REPORT_LIMIT = 50  # Offending rows listed in the upload response
+
 # ============================================================================
 # FEATURE FLAGS
 # ============================================================================
@@ -190,7 +315,8 @@ FEATURES = {
     'ENABLE_INTERACTIVE_CHECKBOXES': True,
     'ENABLE_COMPREHENSIVE_LOGGING': True,
     'ENABLE_DATA_VALIDATION': True,
-    'ENABLE_SESSION_CLEANUP': True
+    'ENABLE_SESSION_CLEANUP': True,
+    'ENABLE_DEBUG_HEADERS': os.getenv('ENABLE_DEBUG_HEADERS', 'false').lower() == 'true'
 }
 # ============================================================================
 # COLUMN DEFINITIONS
@@ -210,6 +336,12 @@ PDF_COLUMNS = [
     'ASSIGNED_PAS_CLEARTEXT', 'DOR', 'TAFMSD', 'ASSIGNED_PAS'
 ]
 
+# Added during ingestion to record which file/sheet each row came from
+PROVENANCE_COLUMNS = ['SOURCE_FILE', 'SOURCE_SHEET']
+
+# Keyed member identity (HMAC of SSAN, or of FULL_NAME + TAFMSD) - see member_index.py
+MEMBER_KEY_COLUMN = 'MEMBER_KEY'
+
 # ============================================================================
 # GRADE AND PROMOTION MAPPINGS
 # ============================================================================
@@ -1,6 +1,7 @@
 import pandas as pd
 from datetime import datetime
 from typing import Optional, List, Union
+from constants import date_input_format
 
 
 def parse_date(
@@ -38,4 +39,33 @@ def parse_date(
     if error_log and full_name:
         error_log.append(f"Date parsing failed for {full_name}: '{original_value}' (type: {original_type})")
 
-    return None
\ No newline at end of file
+    return None
+
+
+def parse_date_column(series: pd.Series) -> pd.Series:
+    """
+    Vectorized equivalent of parse_date for a whole column.
+    Returns datetime64 values; NaT where the value is blank or unreadable.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+
+    # Excel serial dates (numbers) - same range parse_date accepts
+    numeric = pd.to_numeric(series, errors='coerce')
+    is_serial = numeric.between(1, 2958465)
+    parsed = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    if is_serial.any():
+        parsed[is_serial] = pd.to_datetime(numeric[is_serial], unit='D', origin='1899-12-30')
+
+    text = series[~is_serial & series.notna()]
+    if text.empty:
+        return parsed
+    text = text.astype(str)
+
+    # Fast path for the roster's own format (01-JAN-2020), inference only for the leftovers
+    fast = pd.to_datetime(text, format=date_input_format, errors='coerce')
+    parsed[fast.index] = fast
+    leftover = text[fast.isna() & text.ne('')]
+    if not leftover.empty:
+        parsed[leftover.index] = pd.to_datetime(leftover, format='mixed', errors='coerce')
+    return parsed
@@ -0,0 +1,247 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from constants import JOURNAL_COMPACT_ENTRIES, JOURNAL_UNDO_LIMIT, MEMBER_KEY_COLUMN
+from member_table import (
+    JOURNAL_FIELD, JOURNALED_FIELDS, list_member, member_locations, member_value, replay_entry, set_overlay,
+    unlist_member
+)
+from pascode_index import member_pascode, update_pascode_index
+from session_manager import AsyncSessionTransaction, SessionTransaction
+
+
+# =============================================================================
+# EDIT JOURNAL - roster edits are appended, not written over the member table
+# =============================================================================
+#
+# Every add, edit and delete of a roster member is one entry, sealed like any
+# session field and written once to its own field:
+#   journal:<seq>  {"seq", "op", "id" (member id), "category", "at", ...}
+#     edit    "set": {field: [before, after]}
+#     delete  "set" (deleted, deletion_reason), "reason"          soft delete
+#     remove  "index", "key" (when it leaves the roster), "reason" hard delete
+#     add     "index", "row", "overlay", "key", "reason"
+#     undo / redo  "of": seq, "entry": the entry undone or redone
+# The journal field lists the entries since the last compaction:
+#   journal        {"seq": last entry, "base": last entry folded into the stored
+#                   members and member_index, "pending": [entries after base],
+#                   "undo": [seqs], "redo": [seqs]}
+#
+# members and member_index are the large roster fields. An edit leaves them as
+# stored; they are read with the pending entries replayed (member_table.
+# replay_entry, applied by session_manager as they are decoded and kept in the
+# session cache per version). Once JOURNAL_COMPACT_ENTRIES are pending the edit
+# that adds the next one writes both back and empties the list. The other fields
+# an entry changes are written directly: overlays on edits and soft deletes, and
+# on adds and hard deletes the whole categories lists and member_locations map
+# (listing or unlisting a member also shifts the positions of the members after
+# it). Those stay out of the journal because recalculate_small_units rewrites
+# them directly whenever small_unit changes, so an add or hard delete still
+# costs a write of both fields.
+#
+# Undo applies an entry in reverse, redo applies it again; both are entries too
+# and carry the entry they apply, so the journal is a complete audit trail and
+# replaying it never looks another entry up.
+#
+# Every entry changes one member, so applying one also moves that member in the
+# PASCODE index (see pascode_index.py).
+
+
+def entry_field(seq: int) -> str:
+    return f"{JOURNAL_FIELD}:{seq}"
+
+
+def empty_journal() -> Dict[str, Any]:
+    return {"seq": 0, "base": 0, "pending": [], "undo": [], "redo": []}
+
+
+def _journal(session: SessionTransaction) -> Dict[str, Any]:
+    return dict(session.get(JOURNAL_FIELD) or empty_journal())
+
+
+def _entry_member(entry: Dict[str, Any]) -> int:
+    while entry['op'] in ('undo', 'redo'):
+        entry = entry['entry']
+    return entry['id']
+
+
+def _apply(session: SessionTransaction, entry: Dict[str, Any], reverse: bool = False) -> None:
+    """
+    Apply an entry to the open transaction: members and member_index are changed
+    in place (the stored fields stay as they are; the journal replays the entry),
+    overlays and the PASCODE index are staged, and so are the complete categories
+    and member_locations fields for an add or remove.
+    """
+    member_id = _entry_member(entry)
+    before = member_pascode(session, member_id)
+    for field in JOURNALED_FIELDS:
+        value = session.get(field)
+        if value is not None:
+            replay_entry(field, value, entry, reverse)
+    _stage_entry(session, entry, reverse)
+    update_pascode_index(session, before, member_pascode(session, member_id))
+
+
+def _stage_entry(session: SessionTransaction, entry: Dict[str, Any], reverse: bool) -> None:
+    op = entry['op']
+    if op in ('undo', 'redo'):
+        _stage_entry(session, entry['entry'], (op == 'undo') != reverse)
+        return
+
+    member_id = entry['id']
+    if op in ('edit', 'delete'):
+        columns = session['members']['columns']
+        changes = {key: change for key, change in entry['set'].items() if key not in columns}
+        if changes:
+            overlays = session.get('overlays') or {}
+            overlay = overlays.setdefault(str(member_id), {})
+            for key, (before, after) in changes.items():
+                value = before if reverse else after
+                if value is None:
+                    overlay.pop(key, None)
+                else:
+                    overlay[key] = value
+            if not overlay:
+                del overlays[str(member_id)]
+            session.update(overlays=overlays)
+        return
+
+    # add lists the member in its category, remove unlists it
+    categories = session['categories']
+    locations = member_locations(session)
+    listing = (op == 'add') != reverse
+    if listing:
+        position = list_member(categories, locations, entry['category'], member_id, entry['index'])
+    else:
+        position = unlist_member(categories, locations, entry['category'], member_id)
+        if position is None:
+            return
+    if position < len(categories[entry['category']]) - (1 if listing else 0):
+        # Members after it moved
+        session.mark_layout_changed()
+    session.update(categories=categories, member_locations=locations)
+
+    if listing and entry.get('overlay'):
+        overlays = session.get('overlays') or {}
+        set_overlay(overlays, member_id, **entry['overlay'])
+        session.update(overlays=overlays)
+
+
+def _append(session: SessionTransaction, journal: Dict[str, Any], entry: Dict[str, Any]) -> Dict[str, Any]:
+    seq = journal['seq'] + 1
+    entry = {'seq': seq, **entry, 'at': datetime.now().isoformat(timespec='seconds')}
+    journal.update(seq=seq, pending=journal['pending'] + [entry])
+    if len(journal['pending']) >= JOURNAL_COMPACT_ENTRIES:
+        # Fold the pending entries into the stored fields
+        session.update(**{field: session[field] for field in JOURNALED_FIELDS if field in session})
+        journal.update(base=seq, pending=[])
+    session.update(**{JOURNAL_FIELD: journal, entry_field(seq): entry})
+    return entry
+
+
+def _record(session: SessionTransaction, entry: Dict[str, Any]) -> Dict[str, Any]:
+    journal = _journal(session)
+    _apply(session, entry)
+    journal.update(undo=(journal['undo'] + [journal['seq'] + 1])[-JOURNAL_UNDO_LIMIT:], redo=[])
+    return _append(session, journal, entry)
+
+
+def _changes(session: SessionTransaction, member_id: int, values: Dict[str, Any]) -> Dict[str, List[Any]]:
+    """{field: [before, after]} for the values that differ from the member's current ones."""
+    members = session['members']
+    overlay = (session.get('overlays') or {}).get(str(member_id), {})
+    changes = {}
+    for key, value in values.items():
+        before = member_value(members, member_id, key) if key in members['columns'] else overlay.get(key)
+        if before != value:
+            changes[key] = [before, value]
+    return changes
+
+
+def record_edit(session: SessionTransaction, member_id: int, category: str,
+                values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Change a member's fields. Returns the entry, or None when nothing changed."""
+    changes = _changes(session, member_id, values)
+    if not changes:
+        return None
+    return _record(session, {'op': 'edit', 'id': member_id, 'category': category, 'set': changes})
+
+
+def record_soft_delete(session: SessionTransaction, member_id: int, category: str,
+                       reason: str) -> Optional[Dict[str, Any]]:
+    """
+    Mark a member as deleted wherever it is listed. Returns the entry, or None
+    when it already is, for the same reason.
+    """
+    changes = _changes(session, member_id, {'deleted': True, 'deletion_reason': reason})
+    if not changes:
+        return None
+    return _record(session, {'op': 'delete', 'id': member_id, 'category': category, 'set': changes,
+                             'reason': reason})
+
+
+def record_removal(session: SessionTransaction, member_id: int, category: str, reason: str) -> Dict[str, Any]:
+    """Remove a member from a category list; later members move up one position."""
+    location = member_locations(session)[str(member_id)]
+    # small_unit is rebuilt from eligible after every edit, so the other lists
+    # decide whether the member stays on the roster (and in member_index)
+    key = None
+    if not any(name not in (category, 'small_unit') for name in location):
+        key = member_value(session['members'], member_id, MEMBER_KEY_COLUMN)
+    return _record(session, {'op': 'remove', 'id': member_id, 'category': category, 'index': location[category],
+                             'key': key, 'reason': reason})
+
+
+def record_add(session: SessionTransaction, category: str, row: Dict[str, Any],
+               overlay: Optional[Dict[str, Any]], reason: str) -> Dict[str, Any]:
+    """Add a member (row holds its upload columns, including MEMBER_KEY) at the end of a category list."""
+    entry = {'op': 'add', 'id': session['members']['next_id'], 'category': category,
+             'index': len(session['categories'][category]), 'row': row, 'overlay': overlay,
+             'key': row.get(MEMBER_KEY_COLUMN), 'reason': reason}
+    return _record(session, entry)
+
+
+# --- undo and redo --------------------------------------------------------
+
+def undo_target(session: SessionTransaction) -> Optional[int]:
+    """Seq of the entry undo would reverse, or None."""
+    stack = _journal(session)['undo']
+    return stack[-1] if stack else None
+
+
+def redo_target(session: SessionTransaction) -> Optional[int]:
+    stack = _journal(session)['redo']
+    return stack[-1] if stack else None
+
+
+async def async_load_entries(session_id: str, seqs: Iterable[int],
+                             journal: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Entries by seq: from the journal's pending list when given, the rest from
+    their own fields (entries never change once written).
+    """
+    seqs = list(seqs)
+    found = {entry['seq']: entry for entry in (journal or {}).get('pending', [])}
+    stored = [entry_field(seq) for seq in seqs if seq not in found]
+    if stored:
+        async with AsyncSessionTransaction(session_id, fields=stored) as session:
+            for field in stored:
+                entry = session.get(field)
+                if entry is not None:
+                    found[entry['seq']] = entry
+    return [found[seq] for seq in seqs if seq in found]
+
+
+def record_undo(session: SessionTransaction, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Reverse the entry on top of the undo stack (see undo_target)."""
+    journal = _journal(session)
+    _apply(session, entry, reverse=True)
+    journal.update(undo=journal['undo'][:-1], redo=journal['redo'] + [entry['seq']])
+    return _append(session, journal, {'op': 'undo', 'of': entry['seq'], 'entry': entry})
+
+
+def record_redo(session: SessionTransaction, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply the entry on top of the redo stack (see redo_target) again."""
+    journal = _journal(session)
+    _apply(session, entry)
+    journal.update(undo=(journal['undo'] + [entry['seq']])[-JOURNAL_UNDO_LIMIT:], redo=journal['redo'][:-1])
+    return _append(session, journal, {'op': 'redo', 'of': entry['seq'], 'entry': entry})
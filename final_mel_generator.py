@@ -8,6 +8,7 @@ from reportlab.lib.units import inch
 from reportlab.lib.pagesizes import landscape, letter
 from promotion_eligible_counter import get_promotion_eligibility
 from session_manager import get_session
+from member_table import category_records
 from constants import (
     ELIGIBLE_HEADER_ROW, INELIGIBLE_HEADER_ROW,
     ELIGIBLE_TABLE_WIDTHS, INELIGIBLE_TABLE_WIDTHS,
@@ -289,9 +290,14 @@ def generate_small_unit_final_mel_pdf(small_unit_data, senior_rater, cycle, melY
         print(f"Error generating small unit final MEL PDF: {e}")
         return None
 
-def generate_final_roster_pdf(session_id, output_filename="final_military_roster.pdf", logo_path=None):
-    """Generate a final MEL PDF with interactive form fields."""
-    session = get_session(session_id)
+def generate_final_roster_pdf(session_id, output_filename="final_military_roster.pdf", logo_path=None, session=None):
+    """
+    Generate a final MEL PDF with interactive form fields.
+    Returns the PDF bytes, or None if nothing could be generated.
+    Reuses an already loaded session (e.g. the caller's SessionTransaction) when given.
+    """
+    if session is None:
+        session = get_session(session_id)
 
     # Validate session exists
     if not session:
@@ -327,10 +333,10 @@ def generate_final_roster_pdf(session_id, output_filename="final_military_roster
 
         return df
 
-    eligible_df = clean_dataframe(session.get('eligible_df', []))
-    ineligible_df = clean_dataframe(session.get('ineligible_df', []))
-    discrepancy_df = clean_dataframe(session.get('discrepancy_df', []))
-    small_unit_df = clean_dataframe(session.get('small_unit_df', []))
+    eligible_df = clean_dataframe(category_records(session, 'eligible'))
+    ineligible_df = clean_dataframe(category_records(session, 'ineligible'))
+    discrepancy_df = clean_dataframe(category_records(session, 'discrepancy'))
+    small_unit_df = clean_dataframe(category_records(session, 'small_unit'))
     senior_raters = session.get('srid_pascode_map', {})
     cycle = session.get('cycle')
     melYear = session.get('year')
@@ -413,4 +419,4 @@ def generate_final_roster_pdf(session_id, output_filename="final_military_roster
             if small_unit_pdf: temp_pdfs.append(small_unit_pdf)
         except Exception as e:
             print(f"Error generating small unit final MEL PDF: {e}")
-    return merge_pdfs(temp_pdfs, session_id) if temp_pdfs else None
+    return merge_pdfs(temp_pdfs) if temp_pdfs else None
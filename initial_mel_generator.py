@@ -7,6 +7,7 @@ from reportlab.lib.units import inch
 
 from promotion_eligible_counter import get_promotion_eligibility
 from session_manager import get_session
+from member_table import category_records
 from constants import (
     INITIAL_MEL_HEADER_ROW, INITIAL_MEL_INELIGIBLE_HEADER_ROW,
     INITIAL_MEL_TABLE_WIDTHS, INITIAL_MEL_INELIGIBLE_TABLE_WIDTHS,
@@ -88,10 +89,15 @@ def generate_small_unit_pdf(small_unit_data, senior_rater, cycle, melYear, pas_i
         print(f"Error generating small unit PDF: {e}")
         return None
 
-def generate_roster_pdf(session_id, output_filename, logo_path=None):
-    """Generate a military roster PDF from session data."""
+def generate_roster_pdf(session_id, output_filename, logo_path=None, session=None):
+    """
+    Generate a military roster PDF from session data.
+    Returns the PDF bytes, or None if nothing could be generated.
+    Reuses an already loaded session (e.g. the caller's SessionTransaction) when given.
+    """
     try:
-        session = get_session(session_id)
+        if session is None:
+            session = get_session(session_id)
         if not session:
             print(f"Error: Session {session_id} not found or expired")
             return None
@@ -126,11 +132,11 @@ def generate_roster_pdf(session_id, output_filename, logo_path=None):
 
             return df
 
-        eligible_df = clean_dataframe(session.get('eligible_df', []))
-        ineligible_df = clean_dataframe(session.get('ineligible_df', []))
-        discrepancy_df = clean_dataframe(session.get('discrepancy_df', []))
-        btz_df = clean_dataframe(session.get('btz_df', []))
-        small_unit_df = clean_dataframe(session.get('small_unit_df', []))
+        eligible_df = clean_dataframe(category_records(session, 'eligible'))
+        ineligible_df = clean_dataframe(category_records(session, 'ineligible'))
+        discrepancy_df = clean_dataframe(category_records(session, 'discrepancy'))
+        btz_df = clean_dataframe(category_records(session, 'btz'))
+        small_unit_df = clean_dataframe(category_records(session, 'small_unit'))
         cycle = session.get('cycle')
         melYear = session.get('year')
         pascode_map = session.get('pascode_map', {})
@@ -186,7 +192,7 @@ def generate_roster_pdf(session_id, output_filename, logo_path=None):
             )
             if small_unit_pdf:
                 temp_pdfs.append(small_unit_pdf)
-            return merge_pdfs(temp_pdfs, session_id)
+            return merge_pdfs(temp_pdfs)
         for pascode in unique_pascodes:
             if pascode not in pascode_map:
                 continue
@@ -271,7 +277,7 @@ def generate_roster_pdf(session_id, output_filename, logo_path=None):
             )
             if small_unit_pdf:
                 temp_pdfs.append(small_unit_pdf)
-        return merge_pdfs(temp_pdfs, session_id)
+        return merge_pdfs(temp_pdfs)
     except Exception as e:
         print(f"Error generating roster PDF: {e}")
         return None
@@ -166,6 +166,14 @@ class LoggerSetup:
 
         return logger
 
+    @classmethod
+    def get_dry_run_logger(cls):
+        """
+        Logger for dry-run uploads. No per-session log file is created;
+        warnings and errors go to the general log.
+        """
+        return cls.get_logger('dry_run', level=logging.WARNING)
+
     @classmethod
     def close_session_logger(cls, session_id: str):
         """